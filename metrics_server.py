@@ -0,0 +1,344 @@
+import argparse
+import asyncio
+import itertools
+import json
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+from urllib.request import Request, urlopen
+
+from run_simulation import CollapseModel, collect_step_metrics
+
+
+REQUIRED_PARAMS = ('steps', 'num_households', 'init_inflation_rate', 'init_employment_rate')
+
+
+def is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_params(params):
+    """Returns an error message for unusable job parameters, or None."""
+    if not isinstance(params, dict):
+        return "Parameters must be a JSON object"
+    missing = [key for key in REQUIRED_PARAMS if key not in params]
+    if missing:
+        return f"Missing parameters: {', '.join(missing)}"
+    if not is_integer(params['steps']) or params['steps'] < 0:
+        return "steps must be a non-negative integer"
+    # Setup samples two shock-zone households, so smaller populations cannot run
+    if not is_integer(params['num_households']) or params['num_households'] < 2:
+        return "num_households must be an integer of at least 2"
+    if 'num_firms' in params and (not is_integer(params['num_firms']) or params['num_firms'] < 1):
+        return "num_firms must be a positive integer"
+    for key in ('init_inflation_rate', 'init_employment_rate'):
+        if not is_number(params[key]):
+            return f"{key} must be a number"
+    return None
+
+
+class Subscriber:
+    """
+    A single client's view of a job's metric stream.
+    The queue is bounded: when it is full the oldest pending update is dropped, so a
+    lagging client keeps receiving the newest steps, and the stride between delivered
+    steps doubles once per overflow. Each time the client drains below the low
+    watermark, the stride halves back toward the one it asked for.
+    """
+
+    def __init__(self, every=1, max_pending=256, low_watermark=None):
+        self.requested_every = max(1, every)
+        self.every = self.requested_every
+        self.queue = asyncio.Queue(max_pending)
+        self.low_watermark = max_pending // 4 if low_watermark is None else low_watermark
+        self.overflowed = False
+
+    def offer(self, step, metrics):
+        if step % self.every:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            if not self.overflowed:
+                self.every *= 2
+                self.overflowed = True
+        self.queue.put_nowait((step, metrics))
+
+    def relax(self):
+        """Called after each write to the client; recovers the stride once it has caught up."""
+        if self.queue.qsize() <= self.low_watermark:
+            self.overflowed = False
+            self.every = max(self.requested_every, self.every // 2)
+
+    def close(self):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class SimulationJob:
+
+    def __init__(self, job_id, params, history_size=100_000):
+        self.id = job_id
+        self.params = params
+        self.history = deque(maxlen=history_size)
+        self.subscribers = set()
+        self.step = -1
+        self.events = []  # Event log records, available once the run ends
+        self.cancelled = False
+        self.done = False
+        self.error = None
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "step": self.step,
+            "steps": self.params['steps'],
+            "done": self.done,
+            "error": self.error,
+            "subscribers": len(self.subscribers),
+        }
+
+    def publish(self, step, metrics):
+        """Record one step and fan it out; runs on the event loop thread."""
+        self.step = step
+        self.history.append((step, metrics))
+        for subscriber in self.subscribers:
+            subscriber.offer(step, metrics)
+
+    def finish(self, error=None):
+        self.done = True
+        self.error = error
+        for subscriber in self.subscribers:
+            subscriber.close()
+
+    def simulate(self, loop):
+        """Run the model in a worker thread, handing each step to the event loop."""
+        model = CollapseModel(self.params)
+        model.setup()
+        for _ in range(self.params['steps']):
+            if self.cancelled:
+                break
+            model.step()
+            metrics = collect_step_metrics(model)
+            loop.call_soon_threadsafe(self.publish, metrics["Step"], metrics)
+        self.events = model.collect_events().astype({'event': str}).to_dict('records')
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.simulate, loop)
+        except Exception as exc:
+            loop.call_soon(self.finish, repr(exc))
+        else:
+            loop.call_soon(self.finish)
+
+    def subscribe(self, since=-1, every=1):
+        """
+        Registers a subscriber and returns it with the buffered history after `since`.
+        Both happen without yielding to the loop, so no step is missed or repeated.
+        """
+        subscriber = Subscriber(every)
+        backlog = [(s, m) for s, m in self.history if s > since and s % subscriber.every == 0]
+        if self.done:
+            subscriber.close()
+        else:
+            self.subscribers.add(subscriber)
+        return subscriber, backlog
+
+
+class MetricsServer:
+    """Hosts CollapseModel jobs and streams their per-step metrics over Server-Sent Events."""
+
+    def __init__(self, host="127.0.0.1", port=8765, keepalive=15.0, max_finished_jobs=20):
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        self.job_ids = itertools.count(1)
+        self.tasks = set()
+
+    def evict_finished_jobs(self):
+        """Drop the oldest finished jobs beyond max_finished_jobs to bound memory."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    def delete_job(self, job_id):
+        """Forget a job; a running one stops at its next step."""
+        job = self.jobs.pop(job_id)
+        job.cancelled = True
+        return job
+
+    def start_job(self, params):
+        self.evict_finished_jobs()
+        job = SimulationJob(str(next(self.job_ids)), params)
+        self.jobs[job.id] = job
+        task = asyncio.create_task(job.run())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        task.add_done_callback(lambda _: self.evict_finished_jobs())
+        return job
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+    # === HTTP Handling ===
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode().split()
+            if len(request_line) < 2:
+                return
+            method, target = request_line[0], request_line[1]
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            body = b''
+            if int(headers.get('content-length', 0)):
+                body = await reader.readexactly(int(headers['content-length']))
+
+            url = urlsplit(target)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            await self.route(method, url.path.strip('/').split('/'), query, headers, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as exc:
+            try:
+                await self.send_json(writer, 500, {"error": repr(exc)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def route(self, method, parts, query, headers, body, writer):
+        if parts == ['jobs'] and method == 'GET':
+            return await self.send_json(writer, 200, [job.summary() for job in self.jobs.values()])
+
+        if parts == ['jobs'] and method == 'POST':
+            try:
+                params = json.loads(body or b'{}')
+            except ValueError:
+                return await self.send_json(writer, 400, {"error": "Invalid JSON body"})
+            error = validate_params(params)
+            if error:
+                return await self.send_json(writer, 400, {"error": error})
+            return await self.send_json(writer, 201, self.start_job(params).summary())
+
+        job = self.jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == 'jobs' else None
+        if job is not None and len(parts) == 2 and method == 'DELETE':
+            return await self.send_json(writer, 200, self.delete_job(job.id).summary())
+        if job is None or method != 'GET':
+            return await self.send_json(writer, 404, {"error": "Not found"})
+
+        if len(parts) == 2:
+            return await self.send_json(writer, 200, job.summary())
+        if parts[2:] == ['metrics']:
+            return await self.send_json(writer, 200, [m for _, m in job.history])
+        if parts[2:] == ['log']:
+            return await self.send_json(writer, 200, job.events)
+        if parts[2:] == ['events']:
+            try:
+                since = int(headers.get('last-event-id', query.get('since', -1)))
+                every = int(query.get('every', 1))
+            except ValueError:
+                return await self.send_json(writer, 400, {"error": "Invalid since/every"})
+            return await self.stream(job, writer, since, every)
+        return await self.send_json(writer, 404, {"error": "Not found"})
+
+    async def send_json(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def stream(self, job, writer, since, every):
+        """Replay buffered history after `since`, then follow the job live until it ends."""
+        subscriber, backlog = job.subscribe(since, every)
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+            for step, metrics in backlog:
+                writer.write(self.format_event(step, metrics))
+            await writer.drain()
+            subscriber.relax()
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                    await writer.drain()
+                    continue
+                if item is None:
+                    break
+                writer.write(self.format_event(*item))
+                await writer.drain()
+                subscriber.relax()
+
+            writer.write(f"event: done\ndata: {json.dumps(job.summary())}\n\n".encode())
+            await writer.drain()
+        finally:
+            job.subscribers.discard(subscriber)
+
+    @staticmethod
+    def format_event(step, metrics):
+        return f"id: {step}\nevent: metrics\ndata: {json.dumps(metrics)}\n\n".encode()
+
+
+# === Client Helpers ===
+def submit_job(url, params):
+    """Start a job on a running MetricsServer and return its summary."""
+    request = Request(f"{url}/jobs", data=json.dumps(params).encode(), method='POST',
+                      headers={'Content-Type': 'application/json'})
+    with urlopen(request) as response:
+        return json.load(response)
+
+
+def get_job(url, job_id):
+    """Fetch a job's summary; raises HTTPError (404) for unknown ids."""
+    with urlopen(f"{url}/jobs/{job_id}") as response:
+        return json.load(response)
+
+
+def subscribe(url, job_id, since=-1, every=1):
+    """Blocking generator over a job's metrics, for Streamlit or scripts."""
+    with urlopen(f"{url}/jobs/{job_id}/events?since={since}&every={every}") as response:
+        event, data = None, []
+        for raw in response:
+            line = raw.decode().rstrip('\n')
+            if line.startswith('event:'):
+                event = line[6:].strip()
+            elif line.startswith('data:'):
+                data.append(line[5:].strip())
+            elif not line and data:
+                if event == 'done':
+                    return
+                yield json.loads('\n'.join(data))
+                event, data = None, []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream simulation metrics to dashboard clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(MetricsServer(args.host, args.port).serve())
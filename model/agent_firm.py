@@ -1,13 +1,13 @@
 from agentpy import Agent
-import random
 
 class Firm(Agent):
 
     def setup(self):
-        self.num_employees = random.randint(50, 150)
+        self.num_employees = self.model.random.randint(50, 150)
         self.production_capacity = 1000
         self.inventory = 0
-        self.base_wage = random.uniform(60, 100)
+        self.units_sold = 0
+        self.base_wage = self.model.random.uniform(60, 100)
         self.profit = 0
         self.loss_streak = 0
         self.bankrupt = False
@@ -18,13 +18,11 @@ class Firm(Agent):
         unrest_penalty = (self.model.unrest / max(1, self.model.num_households)) * 30
         return inflation_penalty + unrest_penalty
 
-    def expected_demand_factor(self):
-        return max(0.5, self.model.employment_rate)
-
     # === Bankruptcy Check ===
     def check_bankruptcy(self):
         if self.loss_streak >= 3 and self.profit < -1000:
             self.bankrupt = True
+            self.model.event_log.log('bankruptcy', agent_id=self.id, magnitude=self.profit)
             self.num_employees = 0
             self.inventory = 0
             self.production_capacity = int(self.production_capacity * 0.5)
@@ -50,16 +48,13 @@ class Firm(Agent):
     # === Sales ===
     def sell_goods(self):
         price_per_unit = 60 + self.model.inflation_rate * 10
-        expected_factor = self.expected_demand_factor()
 
-        # Estimate demand for this firm
-        average_household_demand = (self.model.total_demand / max(1, len(self.model.firms)))
-        demand = min(self.inventory, int(average_household_demand * expected_factor))
+        # Units allocated to this firm by the market-clearing stage
+        sold = min(self.inventory, self.units_sold)
 
-        revenue = demand * price_per_unit
+        revenue = sold * price_per_unit
         self.profit += revenue
-        self.inventory -= demand
-        self.model.total_demand += demand  # Booked demand
+        self.inventory -= sold
 
     # === Wage Payment ===
     def pay_wages(self):
@@ -68,13 +63,21 @@ class Firm(Agent):
         self.profit -= wage_bill
 
         # Distribute income across random households
-        employed_households = random.sample(
-            self.model.households,
-            min(self.num_employees, len(self.model.households))
-        )
+        compressor = self.model.compressor
+        if compressor:
+            employed_households = self.model.random.choices(
+                self.model.households,
+                cum_weights=compressor.cum_weights,
+                k=min(self.num_employees, self.model.num_households)
+            )
+        else:
+            employed_households = self.model.random.sample(
+                self.model.households,
+                min(self.num_employees, len(self.model.households))
+            )
 
         for household in employed_households:
-            household.income += wage
+            household.receive_wage(wage)
             self.model.total_income += wage
             self.model.income_distribution.append(wage)
 
@@ -92,15 +95,22 @@ class Firm(Agent):
             self.production_capacity += 10
             self.base_wage *= 1.02
 
-    # === Main Step Function ===
-    def step(self):
+    # === Pre-Market Phase ===
+    def prepare_market(self):
         self.profit = 0  # Reset profit at each step
+        self.units_sold = 0
 
         if self.bankrupt:
             return
 
         self.check_policy_influence()
         self.produce()
+
+    # === Main Step Function ===
+    def step(self):
+        if self.bankrupt:
+            return
+
         self.sell_goods()
         self.pay_wages()
         self.adjust_employment()
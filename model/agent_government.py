@@ -1,5 +1,4 @@
 from agentpy import Agent
-import random
 
 
 class Government(Agent):
@@ -28,14 +27,15 @@ class Government(Agent):
         for household in self.model.households:
             tax = household.wealth * self.tax_rate_household
             household.wealth -= tax
-            self.budget += tax
+            household.wealth_var *= (1 - self.tax_rate_household) ** 2
+            self.budget += tax * household.weight
 
     def provide_subsidies(self):
         """Support low-wealth households and struggling firms."""
         for household in self.model.households:
             if household.wealth < 300:
                 household.wealth += 50
-                self.budget -= 50
+                self.budget -= 50 * household.weight
 
         for firm in self.model.firms:
             if firm.loss_streak >= 2:
@@ -57,7 +57,7 @@ class Government(Agent):
         avg_profit = sum(f.profit for f in self.model.firms) / len(self.model.firms)
         if avg_profit < 0 or self.model.employment_rate < 0.75:
             amount = 100
-            total = amount * len(self.model.households)
+            total = amount * self.model.num_households
             self.budget -= total
 
             for household in self.model.households:
@@ -73,26 +73,30 @@ class Government(Agent):
     def simulate_negative_effects(self):
         """Simulate corruption, policy failure, or random shocks."""
         # Corruption drains budget
-        if random.random() < 0.05:
-            loss = random.randint(500, 2000)
+        if self.model.random.random() < 0.05:
+            loss = self.model.random.randint(500, 2000)
             self.budget = max(0, self.budget - loss)
+            self.model.event_log.log('corruption_loss', agent_id=self.id, magnitude=loss)
 
         # Emergency tax hike if nearly bankrupt
         if self.budget < 2000:
             self.tax_rate_firm += 0.02
             self.tax_rate_household += 0.01
-            self.model.unrest += random.randint(5, 15)
+            unrest = self.model.random.randint(5, 15)
+            self.model.unrest += unrest
+            self.model.event_log.log('emergency_tax_hike', agent_id=self.id, magnitude=unrest)
 
         # Random policy shock
-        if random.random() < 0.03:
-            affected = random.choice(['firm', 'household'])
+        if self.model.random.random() < 0.03:
+            affected = self.model.random.choice(['firm', 'household'])
             if affected == 'firm':
                 for firm in self.model.firms:
                     firm.profit -= 50
             else:
                 for household in self.model.households:
-                    household.wealth = max(0, household.wealth - 50)
+                    household.set_wealth(household.wealth - 50)
             self.model.unrest += 5
+            self.model.event_log.log('policy_shock', agent_id=self.id, magnitude=5)
 
     def step(self):
         """Execute all policy functions in order."""
@@ -1,5 +1,4 @@
 from agentpy import Agent
-import random
 
 class Household(Agent):
 
@@ -7,9 +6,13 @@ class Household(Agent):
         self.num_members = 4                          # Total household members
         self.earners = [True, True]                   # Initially 2 earners
         self.wealth = 10000                            # Initial wealth
-        self.cost_of_living = random.uniform(200, 500)  # Daily expense per member
+        self.cost_of_living = self.model.random.uniform(200, 500)  # Daily expense per member
         self.neighbors = []                           # Assigned in setup
         self.income = 0                               # Earned from firms each step
+        self.demand = 0                               # Goods requested from matched firms
+        self.weight = 1                               # Households represented by this agent
+        self.income_sq = 0                            # Mean squared income across the group
+        self.wealth_var = 0                           # Wealth variance across the group
 
     def update_employment(self):
         """Update employment status based on model rate and peer influence."""
@@ -17,11 +20,11 @@ class Household(Agent):
 
         for i in range(len(self.earners)):
             prob = self.model.employment_rate * (0.8 + 0.2 * neighbor_ratio)
-            self.earners[i] = random.random() < min(1.0, prob)
+            self.earners[i] = self.model.random.random() < min(1.0, prob)
 
         # 10% chance a new household member becomes employable
-        if random.random() < 0.1 and len(self.earners) < self.num_members:
-            self.earners.append(random.random() < self.model.employment_rate)
+        if self.model.random.random() < 0.1 and len(self.earners) < self.num_members:
+            self.earners.append(self.model.random.random() < self.model.employment_rate)
 
     def _get_neighbor_employment_ratio(self):
         """Average employment rate among neighbors."""
@@ -50,13 +53,26 @@ class Household(Agent):
     def update_unrest(self, employed_count):
         """Adjust unrest levels based on employment sufficiency."""
         if employed_count == 0:
-            self.model.unrest += 2
+            self.model.unrest += 2 * self.weight
         elif employed_count == 1:
-            self.model.unrest += 1
+            self.model.unrest += 1 * self.weight
         elif employed_count == 2:
-            self.model.unrest = max(0, self.model.unrest - 5)
+            self.model.unrest = max(0, self.model.unrest - 5 * self.weight)
         else:
-            self.model.unrest = max(0, self.model.unrest - 8)
+            self.model.unrest = max(0, self.model.unrest - 8 * self.weight)
+
+    def set_wealth(self, wealth):
+        """Floor wealth at zero; a group pinned at the floor has no spread left."""
+        if wealth <= 0:
+            self.wealth = 0
+            self.wealth_var = 0
+        else:
+            self.wealth = wealth
+
+    def receive_wage(self, wage):
+        """Credit one employee's wage, spread as a per-household average over the group."""
+        self.income += wage / self.weight
+        self.income_sq += wage ** 2 / self.weight
 
     def step(self):
         self.update_employment()
@@ -64,12 +80,16 @@ class Household(Agent):
 
         # Income earned last round
         earned = self.income
+        if self.weight > 1:
+            # Wages land on some members only, spreading wealth within the group
+            self.wealth_var += max(0, self.income_sq - earned ** 2)
         self.income = 0  # Reset after use
+        self.income_sq = 0
 
         expenses = self.compute_expenses(employed_count)
         self.update_unrest(employed_count)
 
-        self.wealth = max(0, self.wealth + earned - expenses)
+        self.set_wealth(self.wealth + earned - expenses)
 
         # Avoid divide-by-zero in demand
         if len(self.earners) > 0:
@@ -78,5 +98,5 @@ class Household(Agent):
             participation_ratio = 0.0
 
         # Demand is driven by income and willingness to spend
-        demand = min(self.wealth, 50) * participation_ratio
-        self.model.total_demand += demand
+        self.demand = min(self.wealth, 50) * participation_ratio * self.weight
+        self.model.total_demand += self.demand
@@ -1,10 +1,12 @@
 from agentpy import Model, AgentList
-import random
 
 from model.agent_household import Household
 from model.agent_firm import Firm
 from model.agent_government import Government
 from model.shocks import ShockManager
+from model.market import MarketClearing
+from model.events import EventLog
+from model.compression import HouseholdCompressor
 from model.environment import (
     build_household_network,
     build_government_firm_graph,
@@ -28,7 +30,17 @@ class CollapseModel(Model):
         self.employment_rate = self.p['init_employment_rate']
 
         # === Agent Initialization ===
-        self.households = AgentList(self, self.num_households, Household)
+        compression = self.p.get('household_compression')
+        if compression:
+            # Weighted representatives stand in for the full household population
+            options = compression if isinstance(compression, dict) else {}
+            self.compressor = HouseholdCompressor(self, **options)
+            groups = self.compressor.build_groups(self.num_households, num_regions=4)
+            self.households = AgentList(self, len(groups), Household)
+            self.compressor.assign(self.households, groups)
+        else:
+            self.compressor = None
+            self.households = AgentList(self, self.num_households, Household)
         self.firms = AgentList(self, self.num_firms, Firm)
         self.government = Government(self)
 
@@ -37,26 +49,37 @@ class CollapseModel(Model):
         self.firms.model = self
 
         # === Environment & Networks ===
-        self.household_graph = build_household_network(self.households, p_connect=0.1)
-        self.policy_graph = build_government_firm_graph(self.firms, self.government)
-        self.market_graph = build_market_matching(self.households, self.firms)
-        self.regions = assign_regional_clusters(self.households, num_regions=4)
-        self.trade_network = build_trade_network(self.households)
-        self.shock_zones = define_shock_zones(self.households)
+        self.household_graph = build_household_network(self.households, p_connect=0.1, rng=self.random)
+        self.policy_graph = build_government_firm_graph(self.firms, self.government, rng=self.random)
+        self.market_graph = build_market_matching(self.households, self.firms, rng=self.random)
+        self.trade_network = build_trade_network(self.households, rng=self.random)
+        if self.compressor:
+            # Regions and shock zones were sampled over the full population
+            self.regions = self.compressor.regions()
+            self.shock_zones = [i for i, hh in enumerate(self.households) if hh.shock_zone]
+        else:
+            self.regions = assign_regional_clusters(self.households, num_regions=4, rng=self.random)
+            self.shock_zones = define_shock_zones(self.households, rng=self.random)
 
         # === Attach Regional & Trade Data ===
         for household in self.households:
-            household.region = self.regions.get(household, None)
             household.trading_partners = list(self.trade_network.neighbors(household)) \
                 if household in self.trade_network else []
 
         for firm in self.firms:
             firm.policy_graph = self.policy_graph
 
+        self.event_log = EventLog(
+            self,
+            capacity=self.p.get('event_log_capacity', 4096),
+            sink=self.p.get('event_log_sink')
+        )
         self.shock_manager = ShockManager(self)
+        self.market = MarketClearing(self)
 
         # === Macroeconomic Tracking ===
         self.total_demand = 0
+        self.total_sales = 0
         self.total_income = 0
         self.income_distribution = []
         self.previous_gdp = None
@@ -64,7 +87,7 @@ class CollapseModel(Model):
 
     def update_macroeconomics(self):
         # === Inflation Dynamics ===
-        inflation_trend = random.uniform(-0.005, 0.01)
+        inflation_trend = self.random.uniform(-0.005, 0.01)
         if self.employment_rate < 0.8:
             inflation_trend += 0.005
         self.inflation_rate = max(0.0, round(self.inflation_rate + inflation_trend, 3))
@@ -72,9 +95,9 @@ class CollapseModel(Model):
         # === Employment Adjustment ===
         unrest_ratio = self.unrest / self.num_households
         if unrest_ratio > 0.25:
-            self.employment_rate -= random.uniform(0.01, 0.03)
+            self.employment_rate -= self.random.uniform(0.01, 0.03)
         else:
-            self.employment_rate += random.uniform(-0.01, 0.01)
+            self.employment_rate += self.random.uniform(-0.01, 0.01)
 
         self.employment_rate = round(min(1.0, max(0.6, self.employment_rate)), 3)
 
@@ -90,19 +113,27 @@ class CollapseModel(Model):
         return round((2 * cumulative) / (n * sum(values)) - (n + 1) / n, 3)
 
     def step(self):
+        # Advance first so events logged during this step share the recorded step index
+        # (equal to self.t in model.run(); live loops never advance self.t)
+        self.step_count += 1
+
         # === Reset Trackers ===
         self.total_demand = 0
+        self.total_sales = 0
         self.total_income = 0
         self.income_distribution = []
 
         # === Step Agents ===
         self.households.step()
+        self.firms.prepare_market()
+        self.market.clear()
         self.firms.step()
         self.government.step()
-        self.shock_manager.maybe_trigger_shock(self.t)
+        self.shock_manager.maybe_trigger_shock(self.step_count)
 
         # === Macroeconomic Updates ===
-        self.step_count += 1
+        if self.compressor and self.step_count % self.compressor.rebalance_every == 0:
+            self.compressor.rebalance()
         if self.step_count % 90 == 0:
             self.update_macroeconomics()
 
@@ -128,6 +159,7 @@ class CollapseModel(Model):
         self.record('AvgFirmProfit', round(avg_profit, 2))
         self.record('FirmProfitTotal', round(firm_profits, 2))
         self.record('TotalDemand', self.total_demand)
+        self.record('TotalSales', self.total_sales)
         self.record('GDP', gdp)
         self.record('GDPGrowthRate', self.gdp_growth)
         self.record('GiniCoefficient', gini)
@@ -142,6 +174,27 @@ class CollapseModel(Model):
         self.report("AvgFirmProfit", round(avg_profit, 2))
         self.report("FirmProfitTotal", round(sum(f.profit for f in self.firms), 2))
         self.report("TotalDemand", self.total_demand)
+        self.report("TotalSales", self.total_sales)
         self.report("GDPGrowthRate", self.output.get('GDPGrowthRate', [0])[-1])
         self.report("GiniCoefficient", self.output.get('GiniCoefficient', [0])[-1])
         self.report("GDP", self.output.get('GDP', [0])[-1])
+
+        # === Event Log ===
+        self.collect_events()
+
+    def collect_events(self):
+        """
+        Flush the event log into output['events'] and return it. end() calls this;
+        live loops that drive step() directly call it once they finish.
+        """
+        self.event_log.flush()
+        events = self.event_log.to_frame()
+
+        # Tag ensemble runs so combined experiment output stays separable
+        if self._run_id is not None:
+            if self._run_id[0] is not None:
+                events['sample_id'] = self._run_id[0]
+            if len(self._run_id) > 1 and self._run_id[1] is not None:
+                events['iteration'] = self._run_id[1]
+        self.output['events'] = events
+        return events
@@ -0,0 +1,161 @@
+import math
+import numpy as np
+
+from model.agent_household import Household
+
+
+class HouseholdCompressor:
+    """
+    Represents a large household population with a smaller set of weighted agents.
+    Each representative stands for `weight` households sharing region, earner count
+    and binned cost_of_living / wealth. Groups split when their wealth dispersion
+    grows beyond `split_tolerance` and merge back when they fall into the same bin.
+    """
+
+    def __init__(self, model, cost_bins=10, wealth_resolution=0.25,
+                 split_tolerance=0.2, rebalance_every=30):
+        self.model = model
+        self.cost_edges = np.linspace(200, 500, cost_bins + 1)[1:-1]
+        self.wealth_resolution = wealth_resolution
+        self.split_tolerance = split_tolerance
+        self.rebalance_every = rebalance_every
+        self.cum_weights = []
+
+    # === Initial Grouping ===
+    def build_groups(self, population, num_regions, num_zones=2):
+        """
+        Samples the full population's initial states and bins them into groups.
+        Shock-zone households are drawn from the whole population, as
+        define_shock_zones does for the full model, and never share a group with
+        households outside the zones.
+        Returns (region, cost_of_living, weight, shock_zone) for every non-empty bin.
+        """
+        rng = self.model.nprandom
+        region = rng.integers(1, num_regions + 1, size=population)
+        cost = rng.uniform(200, 500, size=population)  # Mirrors Household.setup
+        zone = np.zeros(population, dtype=int)
+        zone[rng.choice(population, size=num_zones, replace=False)] = 1
+
+        cost_slots = len(self.cost_edges) + 1
+        keys = (region * cost_slots + np.digitize(cost, self.cost_edges)) * 2 + zone
+        keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        mean_cost = np.bincount(inverse, weights=cost) / counts
+        group_region = keys // 2 // cost_slots
+
+        return [(int(r), float(c), int(w), bool(z))
+                for r, c, w, z in zip(group_region, mean_cost, counts, keys % 2)]
+
+    def assign(self, households, groups):
+        """Apply group states to freshly created representative agents."""
+        for hh, (region, cost_of_living, weight, shock_zone) in zip(households, groups):
+            hh.region = region
+            hh.cost_of_living = cost_of_living
+            hh.weight = weight
+            hh.shock_zone = shock_zone
+        self.update_weights()
+
+    def regions(self):
+        """Region -> representatives mapping, as returned by assign_regional_clusters."""
+        regions = {}
+        for hh in self.model.households:
+            regions.setdefault(hh.region, []).append(hh)
+        return regions
+
+    def update_weights(self):
+        self.cum_weights = list(np.cumsum([hh.weight for hh in self.model.households]))
+
+    # === Adaptive Regrouping ===
+    def bin_key(self, hh):
+        return (
+            hh.region,
+            int(np.digitize(hh.cost_of_living, self.cost_edges)),
+            int(math.log1p(hh.wealth) / self.wealth_resolution),
+            len(hh.earners),
+            hh.shock_zone,
+        )
+
+    def within_tolerance(self, mean, var):
+        return math.sqrt(max(0.0, var)) <= self.split_tolerance * max(mean, 1.0)
+
+    def pooled_wealth(self, a, b):
+        """Mean and variance of wealth across two groups combined."""
+        w = a.weight + b.weight
+        mean = (a.weight * a.wealth + b.weight * b.wealth) / w
+        second = (a.weight * (a.wealth_var + a.wealth ** 2) +
+                  b.weight * (b.wealth_var + b.wealth ** 2)) / w
+        return mean, max(0.0, second - mean ** 2)
+
+    def merge(self, target, other):
+        """Fold `other` into `target`, pooling means and wealth variance."""
+        w = target.weight + other.weight
+        mean, var = self.pooled_wealth(target, other)
+
+        target.cost_of_living = (target.weight * target.cost_of_living +
+                                 other.weight * other.cost_of_living) / w
+        target.income = (target.weight * target.income + other.weight * other.income) / w
+        target.income_sq = (target.weight * target.income_sq + other.weight * other.income_sq) / w
+        target.wealth = mean
+        target.wealth_var = var
+        target.weight = w
+
+    def split(self, hh):
+        """
+        Split a dispersed group into two subgroups whose two-point wealth distribution
+        keeps the group's mean and variance. Each offset is sized by the other half's
+        weight so weight * wealth is conserved exactly.
+        """
+        child = Household(self.model)
+        for attr in ('region', 'cost_of_living', 'num_members', 'income', 'income_sq',
+                     'demand', 'shock_zone', 'trading_partners'):
+            setattr(child, attr, getattr(hh, attr))
+        child.earners = list(hh.earners)
+        child.neighbors = list(hh.neighbors)
+
+        child.weight = hh.weight // 2
+        hh.weight -= child.weight
+
+        # The lower subgroup moves at most down to zero; the upper one balances it
+        down = min(math.sqrt(hh.wealth_var) * math.sqrt(child.weight / hh.weight), hh.wealth)
+        child.wealth = hh.wealth + down * hh.weight / child.weight
+        hh.wealth = hh.wealth - down
+        child.wealth_var = hh.wealth_var = 0.0
+        return child
+
+    def rebalance(self):
+        """Merge converged groups, split diverged ones and refresh dependent indexes."""
+        model = self.model
+        positions = {hh: i for i, hh in enumerate(model.households)}
+
+        # Merge representatives sharing a bin while their pooled spread stays small
+        survivors, merged_into = {}, {}
+        for hh in model.households:
+            key = self.bin_key(hh)
+            target = survivors.get(key)
+            if target is not None and self.within_tolerance(*self.pooled_wealth(target, hh)):
+                self.merge(target, hh)
+                merged_into[hh] = target
+                continue
+            survivors[key] = hh
+
+        kept = [hh for hh in model.households if hh not in merged_into]
+        rows = [positions[hh] for hh in kept]
+        for hh in kept:
+            hh.neighbors = [n for n in (merged_into.get(n, n) for n in hh.neighbors)
+                            if n is not hh]
+
+        # Split representatives whose wealth has diverged internally
+        children = []
+        for hh in kept:
+            if (hh.weight >= 2 and hh.wealth > 0 and
+                    not self.within_tolerance(hh.wealth, hh.wealth_var)):
+                children.append(self.split(hh))
+                rows.append(positions[hh])
+
+        if not merged_into and not children:
+            return
+
+        model.households[:] = kept + children
+        model.market.matches = model.market.matches[rows]
+        model.shock_manager.region_index = model.shock_manager.build_region_index()
+        model.regions = self.regions()
+        self.update_weights()
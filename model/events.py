@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+EVENT_TYPES = (
+    'financial_crisis',
+    'political_instability',
+    'pandemic_outbreak',
+    'natural_disaster',
+    'technology_crash',
+    'manual_trigger',
+    'bankruptcy',
+    'emergency_tax_hike',
+    'corruption_loss',
+    'policy_shock',
+)
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
+EVENT_DTYPE = np.dtype([
+    ('step', np.int32),
+    ('event', np.uint8),
+    ('agent', np.int32),      # -1 for model-wide events
+    ('magnitude', np.float32),
+])
+
+
+class EventLog:
+    """
+    Fixed-size numpy buffer of events, flushed in bulk whenever it fills.
+    Flushed blocks go to `sink` (a callable taking a structured array) when one is
+    given, which keeps memory bounded for long runs; otherwise they are retained
+    for to_frame() and the run's output.
+    """
+
+    def __init__(self, model, capacity=4096, sink=None):
+        self.model = model
+        self.buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.size = 0
+        self.sink = sink
+        self.chunks = []  # Flushed blocks kept when there is no sink
+        self.flushed = 0
+
+    def log(self, event, agent_id=-1, magnitude=0.0):
+        """Append one event at the current model step."""
+        if self.size == len(self.buffer):
+            self.flush()
+        # step_count matches the recorded step both in model.run() and in live loops
+        self.buffer[self.size] = (self.model.step_count, EVENT_CODES[event], agent_id, magnitude)
+        self.size += 1
+
+    def flush(self):
+        """Hand buffered events to the sink (or keep them) in a single copy."""
+        if self.size:
+            chunk = self.buffer[:self.size].copy()
+            if self.sink:
+                self.sink(chunk)
+            else:
+                self.chunks.append(chunk)
+            self.flushed += self.size
+            self.size = 0
+
+    def records(self):
+        """Events not yet handed to a sink, as one structured array."""
+        return np.concatenate(self.chunks + [self.buffer[:self.size]])
+
+    def to_frame(self):
+        """Events as a DataFrame with readable event names."""
+        df = pd.DataFrame(self.records())
+        df['event'] = pd.Categorical.from_codes(df['event'], categories=EVENT_TYPES)
+        return df
+
+    def __len__(self):
+        return self.flushed + self.size
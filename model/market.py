@@ -0,0 +1,60 @@
+import numpy as np
+from scipy import sparse
+
+
+def build_market_matrix(market_graph, num_households, num_firms):
+    """
+    Converts the household-firm matching graph into a sparse household x firm matrix.
+    Each row is normalised so a household splits its demand evenly across matched firms.
+    """
+    rows, cols = [], []
+    for hh_node, firm_node in market_graph.edges():
+        rows.append(int(hh_node.rsplit('_', 1)[1]))
+        cols.append(int(firm_node.rsplit('_', 1)[1]))
+
+    matches = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)),
+        shape=(num_households, num_firms)
+    )
+    matches.sum_duplicates()
+    matches.data[:] = 1.0
+
+    # Row-normalise so each household's demand is shared across its firms
+    links_per_household = np.diff(matches.indptr)
+    matches.data /= np.repeat(np.maximum(links_per_household, 1), links_per_household)
+    return matches
+
+
+def ration_orders(matches, demand, inventory):
+    """
+    Routes household demand to matched firms and fills every order to a firm at the
+    same ratio, capped by that firm's inventory. Returns units sold per firm.
+    """
+    # Orders placed with each firm: demand spread over each household's matches
+    orders = matches.T @ demand
+
+    fill_ratio = np.divide(inventory, orders, out=np.zeros_like(orders), where=orders > 0)
+    np.minimum(fill_ratio, 1.0, out=fill_ratio)
+    return np.floor(orders * fill_ratio).astype(int)
+
+
+class MarketClearing:
+
+    def __init__(self, model):
+        self.model = model
+        self.matches = build_market_matrix(
+            model.market_graph, len(model.households), len(model.firms)
+        )
+
+    def clear(self):
+        """Allocate household demand to matched firms and ration against inventories."""
+        households = self.model.households
+        firms = self.model.firms
+
+        demand = np.fromiter((hh.demand for hh in households), dtype=float, count=len(households))
+        inventory = np.fromiter((f.inventory for f in firms), dtype=float, count=len(firms))
+
+        sales = ration_orders(self.matches, demand, inventory)
+        for firm, sold in zip(firms, sales):
+            firm.units_sold = int(sold)
+        self.model.total_sales = int(sales.sum())
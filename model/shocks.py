@@ -1,17 +1,73 @@
-import random
+import warnings
+import numpy as np
+
+SHOCK_ZONES = 'shock_zones'
+REGIONAL_SHOCKS = ('pandemic_outbreak', 'natural_disaster')
 
 class ShockManager:
 
     def __init__(self, model):
         self.model = model
         self.last_shock_step = -100  # to prevent back-to-back shocks
+        self.region_severity = self.parse_severity(model.p.get('shock_region_severity', {}))
+        self.region_index = self.build_region_index()
+
+    # === Regional Targeting ===
+    @staticmethod
+    def parse_severity(severity):
+        """Coerce region keys to ids (JSON params arrive with string keys)."""
+        parsed = {}
+        for region, value in severity.items():
+            if region != SHOCK_ZONES:
+                region = int(region)
+            parsed[region] = float(value)
+        return parsed
+
+    def build_region_index(self):
+        """Precompute household positions for every region and for the shock zones."""
+        regions, zones = {}, []
+        for i, hh in enumerate(self.model.households):
+            regions.setdefault(hh.region, []).append(i)
+            if getattr(hh, 'shock_zone', False):
+                zones.append(i)
+
+        index = {r: np.array(idx, dtype=int) for r, idx in regions.items()}
+        index[SHOCK_ZONES] = np.array(zones, dtype=int)
+        return index
+
+    def affected_households(self, regions=None):
+        """
+        Returns household positions hit by a shock and the severity applied to each.
+        `regions` may list region ids and/or 'shock_zones'; None targets every region.
+        """
+        if regions is None:
+            regions = [r for r in self.region_index if r != SHOCK_ZONES]
+
+        positions = [self.region_index.get(r, np.empty(0, dtype=int)) for r in regions]
+        severity = [np.full(len(idx), self.region_severity.get(r, 1.0))
+                    for r, idx in zip(regions, positions)]
+        if not positions:
+            return np.empty(0, dtype=int), np.empty(0)
+
+        positions = np.concatenate(positions)
+        severity = np.concatenate(severity)
+
+        # A household listed under several targets is only hit once
+        positions, first = np.unique(positions, return_index=True)
+        return positions, severity[first]
+
+    def exposure(self, positions, severity):
+        """Severity-weighted share of the population affected by a shock, capped at 1."""
+        households = self.model.households
+        affected = sum(households[i].weight * s for i, s in zip(positions, severity))
+        return min(1.0, max(0.0, float(affected) / max(1, self.model.num_households)))
 
     def maybe_trigger_shock(self, step):
         if step - self.last_shock_step < 100:
             return  # Cooldown period between shocks
 
-        if random.random() < 0.0002:  
-            shock_type = random.choice([
+        if self.model.random.random() < 0.0002:  
+            shock_type = self.model.random.choice([
                 self.financial_crisis,
                 self.political_instability,
                 self.pandemic_outbreak,
@@ -22,7 +78,7 @@ class ShockManager:
             self.last_shock_step = step
 
     def financial_crisis(self):
-        print("[Shock] 💥 Financial Crisis Triggered")
+        self.model.event_log.log('financial_crisis', magnitude=1.0)
         for firm in self.model.firms:
             firm.profit *= 0.3
             firm.production_capacity = int(firm.production_capacity * 0.7)
@@ -30,35 +86,47 @@ class ShockManager:
         self.model.unrest += 20
 
     def political_instability(self):
-        print("[Shock] 🔥 Political Instability Erupts")
+        self.model.event_log.log('political_instability', magnitude=1.0)
         self.model.unrest += 40
         self.model.government.tax_rate_firm += 0.05
         self.model.government.tax_rate_household += 0.03
 
-    def pandemic_outbreak(self):
-        print("[Shock] 🦠 Pandemic Strikes")
-        for firm in self.model.firms:
-            firm.num_employees = int(firm.num_employees * 0.5)
-        self.model.unrest += 25
-        self.model.inflation_rate += 0.03
-
-    def natural_disaster(self):
-        print("[Shock] 🌪️ Natural Disaster Hits")
-        for hh in self.model.households:
-            hh.wealth = max(0, hh.wealth - random.randint(50, 150))
+    def pandemic_outbreak(self, regions=None):
+        positions, severity = self.affected_households(regions)
+        exposure = self.exposure(positions, severity)
+        self.model.event_log.log('pandemic_outbreak', magnitude=exposure)
+
         for firm in self.model.firms:
-            firm.inventory = max(0, firm.inventory - random.randint(50, 100))
-        self.model.unrest += 30
+            firm.num_employees = int(firm.num_employees * (1 - 0.5 * exposure))
+        self.model.unrest += round(25 * exposure)
+        self.model.inflation_rate += 0.03 * exposure
+
+    def natural_disaster(self, regions=None):
+        positions, severity = self.affected_households(regions)
+        exposure = self.exposure(positions, severity)
+        self.model.event_log.log('natural_disaster', magnitude=exposure)
+
+        # Losses are drawn in one batch and applied only to affected households
+        losses = self.model.nprandom.integers(50, 151, size=len(positions)) * severity
+        households = self.model.households
+        for i, loss in zip(positions, losses):
+            hh = households[i]
+            hh.set_wealth(hh.wealth - loss)
+
+        firm_losses = self.model.nprandom.integers(50, 101, size=len(self.model.firms)) * exposure
+        for firm, loss in zip(self.model.firms, firm_losses):
+            firm.inventory = max(0, firm.inventory - int(loss))
+        self.model.unrest += round(30 * exposure)
 
     def technology_crash(self):
-        print("[Shock] ⚡ Tech Infrastructure Collapse")
+        self.model.event_log.log('technology_crash', magnitude=1.0)
         self.model.government.interest_rate += 0.02
         for firm in self.model.firms:
             firm.production_capacity = int(firm.production_capacity * 0.6)
         self.model.inflation_rate += 0.04
         self.model.unrest += 15
         
-    def trigger_shock_by_name(self, shock_name):
+    def trigger_shock_by_name(self, shock_name, regions=None):
         shock_map = {
             'financial_crisis': self.financial_crisis,
             'political_instability': self.political_instability,
@@ -69,8 +137,11 @@ class ShockManager:
 
         shock_fn = shock_map.get(shock_name)
         if shock_fn:
-            print(f"[Manual Trigger] 🚨 {shock_name.replace('_', ' ').title()} activated")
-            shock_fn()
-            self.last_shock_step = self.model.t  # Prevent repeat triggers if desired
+            self.model.event_log.log('manual_trigger')
+            if shock_name in REGIONAL_SHOCKS:
+                shock_fn(regions=regions)
+            else:
+                shock_fn()
+            self.last_shock_step = self.model.step_count  # Prevent repeat triggers if desired
         else:
-            print(f"[Warning] Unknown shock: {shock_name}")
+            warnings.warn(f"Unknown shock: {shock_name}")
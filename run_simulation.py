@@ -1,10 +1,24 @@
 import sys
 import os
 import pandas as pd
+import agentpy as ap
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "model"))
 from base_model import CollapseModel
 
+def collect_step_metrics(model):
+    return {
+        "Step": model.step_count,
+        "Unrest": model.unrest,
+        "Inflation": model.inflation_rate,
+        "EmploymentRate": model.employment_rate,
+        "AvgFirmProfit": sum(f.profit for f in model.firms) / model.num_firms,
+        "TotalDemand": model.total_demand,
+        "TotalSales": model.total_sales,
+        "GDPGrowthRate": model.gdp_growth,
+        "GiniCoefficient": model.compute_gini(),
+    }
+
 def run_simulation(params, live=False, update_callback=None):
     model = CollapseModel(params)
 
@@ -12,26 +26,43 @@ def run_simulation(params, live=False, update_callback=None):
         model.setup()
         model_data = []
 
-        for step in range(params['steps']):
+        for _ in range(params['steps']):
             model.step()
-            step_data = {
-                "Step": step,
-                "Unrest": model.unrest,
-                "Inflation": model.inflation_rate,
-                "EmploymentRate": model.employment_rate,
-                "AvgFirmProfit": sum(f.profit for f in model.firms) / model.num_firms,
-                "TotalDemand": model.total_demand,
-                "GDPGrowthRate": model.gdp_growth,
-                "GiniCoefficient": model.compute_gini(),
-            }
+            step_data = collect_step_metrics(model)
             model_data.append(step_data)
 
             if update_callback:
-                update_callback(step, step_data)
+                update_callback(step_data["Step"], step_data)
 
         df = pd.DataFrame(model_data)
+        model.collect_events()
     else:
         results = model.run(steps=params['steps']).variables
         df = pd.DataFrame(results['CollapseModel'])
 
     return model, df
+
+
+def measure_compression_error(params, compression=True, iterations=10, seed=42):
+    """
+    Runs seeded ensembles of the full and the compressed household model and compares
+    their time-averaged metrics. Each ensemble reports the mean and standard deviation
+    across runs, so the compression error can be read against run-to-run noise.
+    """
+    def ensemble(household_compression):
+        run_params = {**params, 'seed': seed, 'household_compression': household_compression}
+        results = ap.Experiment(CollapseModel, run_params, iterations=iterations, record=True).run(display=False)
+        return results.variables['CollapseModel'].groupby('iteration').mean()
+
+    full = ensemble(None)
+    compressed = ensemble(compression)
+
+    full_mean = full.mean()
+    compressed_mean = compressed.mean()
+    return pd.DataFrame({
+        "FullMean": full_mean,
+        "FullStd": full.std(),
+        "CompressedMean": compressed_mean,
+        "CompressedStd": compressed.std(),
+        "RelativeError": (compressed_mean - full_mean).abs() / full_mean.abs().where(full_mean != 0),
+    })
@@ -3,7 +3,9 @@ import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 import plotly.express as px
+from urllib.error import HTTPError
 from run_simulation import run_simulation
+from metrics_server import submit_job, get_job, subscribe
 
 st.set_page_config(layout="wide")
 st.title("🧠 Black Swan Socioeconomic Simulation Dashboard")
@@ -36,6 +38,9 @@ with advanced_tab:
     step_mode = st.checkbox("Enable Manual Step Mode")
     enable_networks = st.checkbox("Show Agent Networks", value=True)
     enable_live_plot = st.checkbox("Live Economic Charting", value=True)
+    compress_households = st.checkbox("Compress Households into Weighted Representatives")
+    metrics_server_url = st.text_input("Metrics Server URL (optional, e.g. http://127.0.0.1:8765)")
+    attach_job_id = st.text_input("Attach to Running Job ID (requires Metrics Server URL)")
 
 if st.button("🚀 Run Simulation"):
     st.info("Running simulation... this may take a few seconds.")
@@ -54,12 +59,15 @@ if st.button("🚀 Run Simulation"):
         'init_unrest': initial_unrest,
         'init_employment_rate': initial_employment,
         'shock_steps': list(active_shocks.values()),
-        'shock_labels': list(active_shocks.keys())
+        'shock_labels': list(active_shocks.keys()),
+        'household_compression': compress_households
     }
 
+    total_steps = simulation_steps
+
     def update_progress(i, var_data):
-        progress_bar.progress(int(i / simulation_steps * 100))
-        status_text.text(f"Step {i} of {simulation_steps}")
+        progress_bar.progress(min(100, int(i / max(1, total_steps) * 100)))
+        status_text.text(f"Step {i} of {total_steps}")
         if i in params['shock_steps']:
             shock_index = params['shock_steps'].index(i)
             shock_display.warning(f"⚠️ Shock at step {i} - {params['shock_labels'][shock_index]}")
@@ -73,7 +81,23 @@ if st.button("🚀 Run Simulation"):
             chart = px.line(live_df, x="step", y=live_df.columns[1:], title="📊 Live Economic Metrics")
             placeholder_chart.plotly_chart(chart, use_container_width=True)
 
-    model, results = run_simulation(params, live=True, update_callback=update_progress)
+    if metrics_server_url:
+        # Run on the shared metrics server so other dashboards can attach to the same job
+        server_url = metrics_server_url.rstrip('/')
+        try:
+            job = get_job(server_url, attach_job_id) if attach_job_id else submit_job(server_url, params)
+        except HTTPError as exc:
+            st.error(f"Metrics server rejected the request ({exc.code}): {exc.read().decode()}")
+            st.stop()
+        job_id, total_steps = job['id'], job['steps']
+        st.caption(f"Streaming job {job_id} from {server_url}")
+        rows = []
+        for step_data in subscribe(server_url, job_id):
+            rows.append(step_data)
+            update_progress(step_data["Step"], step_data)
+        model, results = None, pd.DataFrame(rows)
+    else:
+        model, results = run_simulation(params, live=True, update_callback=update_progress)
 
     st.success("Simulation Complete ✅")
 
@@ -101,7 +125,12 @@ if st.button("🚀 Run Simulation"):
             "Step": params['shock_steps']
         }).sort_values("Step"))
 
-    if enable_networks:
+    events = model.event_log.to_frame() if model else pd.DataFrame()
+    if len(events):
+        st.subheader("📜 Event Log")
+        st.dataframe(events)
+
+    if enable_networks and model:
         st.subheader("🔗 Agent Networks")
 
         def plot_network(G, title):
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from model.base_model import CollapseModel
+
+PARAMS = {
+    'steps': 5,
+    'num_households': 20000,
+    'num_firms': 10,
+    'init_inflation_rate': 0.03,
+    'init_employment_rate': 0.95,
+    'seed': 7,
+    'household_compression': {'rebalance_every': 1000},
+}
+
+
+def totals(model):
+    households = model.households
+    return sum(hh.weight for hh in households), sum(hh.weight * hh.wealth for hh in households)
+
+
+def test_rebalance_conserves_weight_and_wealth():
+    model = CollapseModel(PARAMS)
+    model.sim_setup()
+    for _ in range(3):
+        model.sim_step()
+
+    # Give groups uneven wealth and wide internal spread so both splits and merges happen
+    for i, hh in enumerate(model.households):
+        hh.wealth = 1000 + 37 * (i % 5)
+        hh.wealth_var = (800 if i % 3 else 50) ** 2
+    model.households[0].wealth_var = 5000 ** 2  # Wider than the mean allows
+
+    weight_before, wealth_before = totals(model)
+    count_before = len(model.households)
+    model.compressor.rebalance()
+    weight_after, wealth_after = totals(model)
+
+    assert len(model.households) != count_before
+    assert weight_after == weight_before == PARAMS['num_households']
+    assert wealth_after == pytest.approx(wealth_before, rel=1e-12)
+    assert all(hh.wealth >= 0 for hh in model.households)
+
+
+def test_floored_groups_do_not_split():
+    model = CollapseModel(PARAMS)
+    model.sim_setup()
+    for hh in model.households:
+        hh.wealth_var = 1e6
+        hh.set_wealth(-10)
+
+    ids_before = {hh.id for hh in model.households}
+    model.compressor.rebalance()
+
+    # Merges may remove agents, but no split may create new ones
+    assert {hh.id for hh in model.households} <= ids_before
+    assert sum(hh.weight * hh.wealth for hh in model.households) == 0
+
+
+def test_shock_zones_cover_the_same_households_as_the_full_model():
+    model = CollapseModel(PARAMS)
+    model.sim_setup()
+
+    zone_groups = [hh for hh in model.households if hh.shock_zone]
+    assert sum(hh.weight for hh in zone_groups) == 2
+    assert model.shock_zones == [i for i, hh in enumerate(model.households) if hh.shock_zone]
+
+    positions, severity = model.shock_manager.affected_households(['shock_zones'])
+    exposure = model.shock_manager.exposure(positions, severity)
+    assert exposure == pytest.approx(2 / PARAMS['num_households'])
+
+
+def test_seeded_runs_are_reproducible_without_global_state():
+    params = {**PARAMS, 'num_households': 5000, 'steps': 40,
+              'household_compression': {'rebalance_every': 10}}
+    state = random.getstate()
+
+    first = CollapseModel(params).run(display=False).variables['CollapseModel']
+    second = CollapseModel(params).run(display=False).variables['CollapseModel']
+
+    assert first.equals(second)
+    assert random.getstate() == state
@@ -0,0 +1,63 @@
+from model.base_model import CollapseModel
+from run_simulation import collect_step_metrics
+
+PARAMS = {
+    'steps': 8,
+    'num_households': 60,
+    'num_firms': 5,
+    'init_inflation_rate': 0.03,
+    'init_employment_rate': 0.95,
+    'seed': 3,
+}
+SHOCK_STEP = 5
+
+
+class ScheduledShockModel(CollapseModel):
+    """Fires one political instability shock at SHOCK_STEP instead of random shocks."""
+
+    def setup(self):
+        super().setup()
+        manager = self.shock_manager
+        manager.maybe_trigger_shock = lambda step: (
+            step == SHOCK_STEP and manager.trigger_shock_by_name('political_instability')
+        )
+
+
+def shock_steps(events):
+    return list(events.loc[events['event'] == 'political_instability', 'step'])
+
+
+def test_batch_events_share_recorded_step():
+    model = ScheduledShockModel(PARAMS)
+    results = model.run(display=False)
+
+    variables = results.variables['ScheduledShockModel']
+    assert shock_steps(results['events']) == [SHOCK_STEP]
+    assert SHOCK_STEP in variables.index
+    # The shock's unrest jump shows up in the row recorded at the same step
+    assert variables.loc[SHOCK_STEP, 'Unrest'] >= 40
+
+
+def test_live_events_share_step_column():
+    model = ScheduledShockModel(PARAMS)
+    model.setup()
+    rows = []
+    for _ in range(PARAMS['steps']):
+        model.step()
+        rows.append(collect_step_metrics(model))
+
+    events = model.collect_events()
+    assert shock_steps(events) == [SHOCK_STEP]
+    assert [row['Step'] for row in rows] == list(range(1, PARAMS['steps'] + 1))
+
+
+def test_sink_receives_flushed_blocks():
+    blocks = []
+    model = CollapseModel({**PARAMS, 'event_log_capacity': 2, 'event_log_sink': blocks.append})
+    model.setup()
+    for _ in range(5):
+        model.event_log.log('policy_shock', magnitude=1.0)
+
+    assert [len(block) for block in blocks] == [2, 2]
+    assert len(model.event_log) == 5
+    assert len(model.event_log.to_frame()) == 1
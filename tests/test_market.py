@@ -0,0 +1,36 @@
+import numpy as np
+from scipy import sparse
+
+from model.market import ration_orders
+
+
+def hand_built_matches():
+    # Household 0 buys from firms 0 and 1, household 1 from firm 1, household 2 from firm 2
+    return sparse.csr_matrix(np.array([
+        [0.5, 0.5, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+    ]))
+
+
+def test_proportional_rationing_respects_inventory():
+    demand = np.array([40.0, 30.0, 10.0])
+    inventory = np.array([100.0, 25.0, 4.0])
+
+    sales = ration_orders(hand_built_matches(), demand, inventory)
+
+    # Firm 0 is unconstrained, firms 1 and 2 sell out
+    assert list(sales) == [20, 25, 4]
+    assert np.all(sales <= inventory)
+
+
+def test_rationing_is_independent_of_firm_order():
+    matches = hand_built_matches()
+    demand = np.array([40.0, 30.0, 10.0])
+    inventory = np.array([100.0, 25.0, 4.0])
+    order = np.array([2, 0, 1])
+
+    sales = ration_orders(matches, demand, inventory)
+    permuted = ration_orders(matches[:, order], demand, inventory[order])
+
+    assert list(permuted) == list(sales[order])
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from metrics_server import MetricsServer, Subscriber, validate_params
+
+PARAMS = {
+    'steps': 3,
+    'num_households': 30,
+    'num_firms': 3,
+    'init_inflation_rate': 0.03,
+    'init_employment_rate': 0.95,
+}
+
+
+class FakeWriter:
+
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+    def status(self):
+        return int(self.data.split(b' ', 2)[1])
+
+    def json(self):
+        return json.loads(self.data.split(b'\r\n\r\n', 1)[1])
+
+
+def test_stalled_subscriber_keeps_newest_steps_and_recovers_stride():
+    subscriber = Subscriber(every=1, max_pending=8, low_watermark=2)
+
+    # A stalled client: nothing drains while the job runs on
+    for step in range(1, 301):
+        subscriber.offer(step, {"Step": step})
+    assert subscriber.every == 2
+
+    pending = [subscriber.queue.get_nowait()[0] for _ in range(subscriber.queue.qsize())]
+    assert pending == list(range(286, 301, 2))
+
+    # Once the client has caught up, the stride drops back to what it asked for
+    subscriber.relax()
+    assert subscriber.every == 1
+    subscriber.offer(301, {"Step": 301})
+    assert subscriber.queue.get_nowait()[0] == 301
+
+
+def test_relax_never_goes_below_requested_stride():
+    subscriber = Subscriber(every=3, max_pending=4, low_watermark=1)
+    for step in range(0, 300, 3):
+        subscriber.offer(step, {})
+    assert subscriber.every == 6
+
+    while not subscriber.queue.empty():
+        subscriber.queue.get_nowait()
+    subscriber.relax()
+    subscriber.relax()
+    assert subscriber.every == 3
+
+
+def test_validate_params_rejects_unusable_jobs():
+    assert validate_params(PARAMS) is None
+    assert validate_params([1]) is not None
+    assert validate_params({'num_households': 200}) is not None
+    assert validate_params({**PARAMS, 'steps': True}) is not None
+    assert validate_params({**PARAMS, 'num_households': "x"}) is not None
+    assert validate_params({**PARAMS, 'num_households': 1}) is not None
+    assert validate_params({**PARAMS, 'num_firms': 0}) is not None
+    assert validate_params({**PARAMS, 'init_inflation_rate': "high"}) is not None
+
+
+def test_finished_jobs_are_evicted_and_can_be_deleted():
+    async def scenario():
+        server = MetricsServer(max_finished_jobs=2)
+        for _ in range(4):
+            server.start_job(PARAMS)
+            await asyncio.gather(*server.tasks)
+            await asyncio.sleep(0)
+        assert list(server.jobs) == ['3', '4']
+
+        writer = FakeWriter()
+        await server.route('DELETE', ['jobs', '3'], {}, {}, b'', writer)
+        assert writer.status() == 200 and writer.json()['id'] == '3'
+        assert list(server.jobs) == ['4']
+
+        writer = FakeWriter()
+        await server.route('POST', ['jobs'], {}, {}, json.dumps({**PARAMS, 'num_households': 1}).encode(), writer)
+        assert writer.status() == 400
+        assert list(server.jobs) == ['4']
+
+    asyncio.run(scenario())